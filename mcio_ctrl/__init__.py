@@ -1,20 +1,25 @@
-from . import (
-    config,
-    controller,
-    envs,
-    gui,
-    gym_lite,
-    instance,
-    mc_mock,
-    mcio_gui,
-    network,
-    server,
-    types,
-    util,
-    world,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .__about__ import __version__
 
+if TYPE_CHECKING:
+    from . import (
+        config,
+        controller,
+        envs,
+        gui,
+        gym_lite,
+        instance,
+        mc_mock,
+        mcio_gui,
+        network,
+        server,
+        types,
+        util,
+        world,
+    )
+
 __all__ = [
     "__version__",
     "config",
@@ -31,3 +36,13 @@ __all__ = [
     "util",
     "world",
 ]
+
+# Submodules are imported on first use so e.g. the mcio command doesn't load
+# OpenGL and zmq just to print help.
+_SUBMODULES = frozenset(__all__) - {"__version__"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
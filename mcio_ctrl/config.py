@@ -1,11 +1,12 @@
 """Persistent config - mcio.yaml"""
 
+import copy
 import logging
 import types
 from dataclasses import asdict, dataclass, field
 from io import StringIO
 from pathlib import Path
-from typing import Any, Final, Optional, TypeAlias
+from typing import Any, ClassVar, Final, Optional, TypeAlias
 
 import dacite
 from ruamel.yaml import YAML
@@ -74,22 +75,40 @@ class Config:
 
 
 class ConfigManager:
+    # Parsed configs keyed by file. Each entry has the (mtime_ns, size) it was parsed at.
+    # Parsing the yaml is slow and the config is loaded often, but rarely changes.
+    _cache: ClassVar[dict[Path, tuple[tuple[int, int], Config]]] = {}
+
     def __init__(self, mcio_dir: Path | str, save: bool = False) -> None:
         """Set save to true to save automatically on exiting"""
         self.save_on_exit = save
         mcio_dir = Path(mcio_dir).expanduser()
         self.config_file = mcio_dir / CONFIG_FILENAME
         self.yaml = YAML(typ="rt")
+        # Loading doesn't need round-trip (comment preserving) mode. The safe loader
+        # is faster, and uses the C parser when ruamel.yaml.clib is installed.
+        self._load_yaml = YAML(typ="safe")
         self.config: Config = Config()
 
     def load(self) -> None:
-        if self.config_file.exists():
-            with open(self.config_file) as f:
-                # load() returns None if the file has no data.
-                cfg_dict = self.yaml.load(f) or {}
-                self.config = Config.from_dict(cfg_dict) or Config()
-        else:
+        try:
+            stat = self.config_file.stat()
+        except FileNotFoundError:
             self.config = Config()
+            return
+
+        # Callers modify self.config, so always hand out a copy of the cached one.
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(self.config_file)
+        if cached is not None and cached[0] == key:
+            self.config = copy.deepcopy(cached[1])
+            return
+
+        with open(self.config_file) as f:
+            # load() returns None if the file has no data.
+            cfg_dict = self._load_yaml.load(f) or {}
+            self.config = Config.from_dict(cfg_dict) or Config()
+        self._cache[self.config_file] = (key, copy.deepcopy(self.config))
 
     def pformat(self) -> str:
         """Pretty print the config"""
@@ -100,6 +119,11 @@ class ConfigManager:
     def save(self) -> None:
         with open(self.config_file, "w") as f:
             self.yaml.dump(self.config.to_dict(), f)
+        # Update the cache here. Relying on load() to see a new (mtime_ns, size) fails
+        # for a same-size rewrite on filesystems with coarse timestamps.
+        stat = self.config_file.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        self._cache[self.config_file] = (key, copy.deepcopy(self.config))
 
     def __enter__(self) -> "ConfigManager":
         self.load()
@@ -1,5 +1,6 @@
 import logging
 import threading
+from collections.abc import Callable
 from typing import Protocol
 
 from . import network, types, util
@@ -75,6 +76,8 @@ class ControllerSync(ControllerCommon):
 class ControllerAsync(ControllerCommon):
     """
     Handles ASYNC mode connections to Minecraft
+    One observation thread receives packets and keeps only the latest in a LatestItemQueue.
+    Actions are sent directly from the caller's thread. Each zmq socket is only used by one thread.
     """
 
     def __init__(
@@ -84,11 +87,21 @@ class ControllerAsync(ControllerCommon):
         observation_port: int | None = None,
         wait_for_connection: bool = True,
         connection_timeout: float | None = None,
+        observation_callback: Callable[[network.ObservationPacket], None] | None = None,
+        decode_frames: bool = False,
+        cursor_drawer: util.CursorDrawer | None = None,
     ):
+        """observation_callback is called from the observation thread after each new
+        observation is queued. E.g., to wake up a GUI loop waiting on other events.
+        If decode_frames is True, the observation thread also decodes each frame and draws
+        the cursor (with cursor_drawer) before queueing, so get_frame_with_cursor() on the
+        received observation is just a lookup. This moves the decode off the caller's thread.
+        """
         self._action_sequence_last_sent = 0
+        self._observation_callback = observation_callback
+        self._decode_frames = decode_frames
+        self._cursor_drawer = cursor_drawer
 
-        self.process_counter = util.TrackPerSecond("ProcessObservationPPS")
-        self.queued_counter = util.TrackPerSecond("QueuedActionsPPS")
         self.check_mode = True
 
         # Flag to signal observation thread to stop.
@@ -101,6 +114,7 @@ class ControllerAsync(ControllerCommon):
             observation_port=observation_port,
             wait_for_connection=wait_for_connection,
             connection_timeout=connection_timeout,
+            conflate=True,  # Only the latest observation is used
         )
 
         # Start observation thread
@@ -150,9 +164,10 @@ class ControllerAsync(ControllerCommon):
             if max_skip is not None and n_skip >= max_skip:
                 LOG.warning("Max-Skip")
                 break
-            LOG.debug(
-                f"SKIPPING obs={observation.sequence} last_action={obs_action_seq} < waiting={wait_seq}"
-            )
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug(
+                    f"SKIPPING obs={observation.sequence} last_action={obs_action_seq} < waiting={wait_seq}"
+                )
             # print(f"SKIPPING obs={observation.sequence} last_action={obs_action_seq} < waiting={wait_seq}")
         return observation
 
@@ -161,8 +176,7 @@ class ControllerAsync(ControllerCommon):
         LOG.info("ObservationThread start")
         while self._running.is_set():
             # RECV 2
-            # I don't think we'll ever drop here. this is a short loop to recv the packet
-            # and put it on the queue to be processed.
+            # The socket is conflated, so zmq has already dropped any older packets.
             observation = self._mcio_conn.recv_observation(block=True)
             if observation is None:
                 continue  # Exiting or packet decode error
@@ -175,6 +189,9 @@ class ControllerAsync(ControllerCommon):
                         f"Mode-Mismatch controller={mode} mcio={observation.mode}"
                     )
 
+            if self._decode_frames and observation.frame:
+                observation.cache_frame_with_cursor(self._cursor_drawer)
+
             dropped = self._observation_queue.put(observation)
             if dropped:
                 # This means the main (processing) thread isn't reading fast enough.
@@ -183,6 +200,8 @@ class ControllerAsync(ControllerCommon):
                 # XXX This should not longer happen since we're using push/pull? Change log level?
                 LOG.debug("Dropped observation packet from processing queue")
                 pass
+            if self._observation_callback is not None:
+                self._observation_callback(observation)
 
         LOG.info("ObservationThread shut down")
 
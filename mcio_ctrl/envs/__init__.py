@@ -8,6 +8,9 @@ __all__ = [
     "minerl_env",
 ]
 
+# Registered here, not in the mcio_ctrl package, so that importing mcio_ctrl (e.g. for
+# the mcio command) doesn't load gymnasium. Import mcio_ctrl.envs before gym.make(),
+# or use gym.make("mcio_ctrl.envs:MCio/MCioEnv-v0"), which imports it for you.
 register(
     id="MCio/MCioEnv-v0",
     entry_point="mcio_ctrl.envs.mcio_env:MCioEnv",
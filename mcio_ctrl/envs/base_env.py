@@ -182,7 +182,8 @@ class MCioBaseEnv(gym.Env[ObsType, ActType], Generic[ObsType, ActType], ABC):
             self.launcher.launch(wait=False)
 
         if self.run_options.mcio_mode == "async":
-            self.ctrl = controller.ControllerAsync()
+            # _get_obs() always needs the frame, so decode it on the observation thread
+            self.ctrl = controller.ControllerAsync(decode_frames=True)
         else:
             self.ctrl = controller.ControllerSync()
 
@@ -90,8 +90,9 @@ class MinerlEnv(MCioBaseEnv[MinerlObservation, MinerlAction]):
         self, packet: mcio.network.ObservationPacket
     ) -> MinerlObservation:
         """Convert an ObservationPacket to the environment observation_space"""
+        # The base env already decoded the frame and drew the cursor into last_frame
         obs: MinerlObservation = {
-            "pov": packet.get_frame_with_cursor(),
+            "pov": self.last_frame,
         }
         self.cursor_map.set(*self.last_cursor_pos)
         # assert obs in self.observation_space
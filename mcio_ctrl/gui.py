@@ -3,13 +3,73 @@ ImageStreamGui class for displaying frames in a window using glfw and opengl.
 Used for gym render.
 """
 
+import ctypes
 import time
 from typing import Any, Callable
 
 import glfw  # type: ignore
 import numpy as np
 import OpenGL.GL as gl  # type: ignore
+import OpenGL.GL.shaders as gl_shaders  # type: ignore
 from numpy.typing import NDArray
+from OpenGL import extensions as gl_extensions  # type: ignore
+
+# Minimal passthrough shaders for drawing the frame texture.
+# GLSL 1.20 so this works with the legacy (2.1) context on MacOS.
+_VERTEX_SHADER = """
+#version 120
+attribute vec2 aPos;
+attribute vec2 aUV;
+varying vec2 vUV;
+void main() {
+    vUV = aUV;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 120
+uniform sampler2D uTex;
+varying vec2 vUV;
+void main() {
+    gl_FragColor = texture2D(uTex, vUV);
+}
+"""
+
+# Quad that fills the window, drawn as a triangle strip.
+# Each vertex is [x, y, u, v]. Positions go from -1 to 1 (opengl normalized coordinates).
+# Row 0 of a frame is the top of the image, but row 0 of the texture is v=0, which
+# opengl puts at the bottom. So v is inverted to flip the image.
+_QUAD_VERTICES = np.array(
+    [
+        [-1, -1, 0, 1],  # bottom left
+        [1, -1, 1, 1],  # bottom right
+        [-1, 1, 0, 0],  # top left
+        [1, 1, 1, 0],  # top right
+    ],
+    dtype=np.float32,
+)
+
+
+def _frame_view(ptr: int, height: int, width: int) -> NDArray[np.uint8]:
+    """numpy view of mapped buffer memory as a (height, width, 3) frame. Doesn't copy."""
+    buf = (ctypes.c_ubyte * (height * width * 3)).from_address(ptr)
+    return np.ctypeslib.as_array(buf).reshape((height, width, 3))
+
+
+# (core version, extension) for the optional GL features. PyOpenGL only recognizes
+# versions in the "GL_VERSION_GL_x_y" form. "GL_VERSION_x_y" is never supported.
+_GL_BUFFER_STORAGE = ("GL_VERSION_GL_4_4", "GL_ARB_buffer_storage")
+_GL_TEXTURE_STORAGE = ("GL_VERSION_GL_4_2", "GL_ARB_texture_storage")
+_GL_MAP_BUFFER_RANGE = ("GL_VERSION_GL_3_0", "GL_ARB_map_buffer_range")
+
+
+def _gl_supports(version: str, extension: str) -> bool:
+    """True if the current context is at least version or has extension. Checking the
+    function pointer isn't enough, it's non-NULL even when the context lacks support."""
+    return bool(
+        gl_extensions.hasGLExtension(version) or gl_extensions.hasGLExtension(extension)
+    )
 
 
 class ImageStreamGui:
@@ -45,9 +105,15 @@ class ImageStreamGui:
         self.frame_width = 0
         self.frame_height = 0
         self.scale = scale
+        self._gl_init()
 
-    def poll(self) -> None:
-        glfw.poll_events()  # Poll for events
+    def poll(self, timeout: float | None = None) -> None:
+        """Process pending window events. With a timeout, wait up to timeout
+        seconds for an event to arrive instead of returning immediately."""
+        if timeout is None or timeout <= 0:
+            glfw.poll_events()
+        else:
+            glfw.wait_events_timeout(timeout)
 
     def show(self, frame: NDArray[np.uint8], poll: bool = True) -> bool:
         """Display the next frame
@@ -110,6 +176,11 @@ class ImageStreamGui:
 
     def close(self) -> None:
         """Clean up resources"""
+        gl.glDeleteTextures([self.texture])
+        self._delete_pbo_fences()
+        gl.glDeleteBuffers(len(self.pbos), self.pbos)
+        gl.glDeleteBuffers(1, [self.vbo])
+        gl.glDeleteProgram(self.program)
         glfw.set_window_should_close(self.window, True)
         glfw.terminate()
 
@@ -172,6 +243,58 @@ class ImageStreamGui:
 
         return window
 
+    def _gl_init(self) -> None:
+        """Create the GL objects that are reused for every frame. Texture and
+        PBO storage is allocated in _auto_resize() once the frame size is known."""
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+
+        self.texture = self._create_texture()
+
+        # Two pixel buffer objects. Frames are uploaded through them alternately so
+        # the driver can transfer one to the texture while we fill the other.
+        self.pbos = gl.glGenBuffers(2)
+        self.pbo_idx = 0
+        # With GL 4.4+ the PBOs are mapped once and stay mapped (see _alloc_gl_storage).
+        # Fences track when the GPU is done reading each one.
+        self.persistent_pbos = _gl_supports(*_GL_BUFFER_STORAGE)
+        self.texture_storage = _gl_supports(*_GL_TEXTURE_STORAGE)
+        self.map_buffer_range = _gl_supports(*_GL_MAP_BUFFER_RANGE)
+        self.pbo_views: list[NDArray[np.uint8]] = []
+        self.pbo_fences: list[Any] = [None] * len(self.pbos)
+
+        # Shader and the static quad it draws. The context is only used for this
+        # window, so the vertex attributes can be set up once here.
+        self.program = gl_shaders.compileProgram(
+            gl_shaders.compileShader(_VERTEX_SHADER, gl.GL_VERTEX_SHADER),
+            gl_shaders.compileShader(_FRAGMENT_SHADER, gl.GL_FRAGMENT_SHADER),
+        )
+        gl.glUseProgram(self.program)
+        gl.glUniform1i(gl.glGetUniformLocation(self.program, "uTex"), 0)
+
+        self.vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(
+            gl.GL_ARRAY_BUFFER, _QUAD_VERTICES.nbytes, _QUAD_VERTICES, gl.GL_STATIC_DRAW
+        )
+        stride = _QUAD_VERTICES.strides[0]
+        for name, offset in (("aPos", 0), ("aUV", 2 * _QUAD_VERTICES.itemsize)):
+            loc = gl.glGetAttribLocation(self.program, name)
+            gl.glEnableVertexAttribArray(loc)
+            gl.glVertexAttribPointer(
+                loc, 2, gl.GL_FLOAT, gl.GL_FALSE, stride, ctypes.c_void_p(offset)
+            )
+
+    def _create_texture(self) -> Any:
+        """Create and bind a texture for the frame. Storage is allocated later."""
+        texture = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+        # Set texture parameters for scaling down/up. The GPU does all the scaling
+        # when the window size doesn't match the frame. Linear filtering when
+        # scaling down, and keep pixels sharp when scaling up.
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+        return texture
+
     def _render(self, frame: NDArray[np.uint8]) -> None:
         """glfw portion of render"""
         self._auto_resize(frame)
@@ -189,61 +312,131 @@ class ImageStreamGui:
             glfw.set_window_size(
                 self.window, int(width * self.scale), int(height * self.scale)
             )
+            self._alloc_gl_storage(width, height)
+
+    def _alloc_gl_storage(self, width: int, height: int) -> None:
+        """(Re)allocate texture and PBO storage for the frame size"""
+        if self.texture_storage:
+            # Immutable storage (GL 4.2+) so the driver doesn't have to revalidate
+            # the texture on each upload. It can't be resized, so replace the texture.
+            gl.glDeleteTextures([self.texture])
+            self.texture = self._create_texture()
+            gl.glTexStorage2D(gl.GL_TEXTURE_2D, 1, gl.GL_RGB8, width, height)
+        else:
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+            gl.glTexImage2D(
+                gl.GL_TEXTURE_2D,
+                0,
+                gl.GL_RGB,
+                width,
+                height,
+                0,
+                gl.GL_RGB,
+                gl.GL_UNSIGNED_BYTE,
+                None,
+            )
+        size = width * height * 3
+        if self.persistent_pbos:
+            # Buffer storage is immutable, so replace the PBOs. Deleting also unmaps them.
+            self._delete_pbo_fences()
+            gl.glDeleteBuffers(len(self.pbos), self.pbos)
+            self.pbos = gl.glGenBuffers(len(self.pbos))
+            flags = (
+                gl.GL_MAP_WRITE_BIT | gl.GL_MAP_PERSISTENT_BIT | gl.GL_MAP_COHERENT_BIT
+            )
+            self.pbo_views = []
+            for pbo in self.pbos:
+                gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, pbo)
+                gl.glBufferStorage(gl.GL_PIXEL_UNPACK_BUFFER, size, None, flags)
+                ptr = gl.glMapBufferRange(gl.GL_PIXEL_UNPACK_BUFFER, 0, size, flags)
+                self.pbo_views.append(_frame_view(int(ptr), height, width))
+        else:
+            for pbo in self.pbos:
+                gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, pbo)
+                gl.glBufferData(
+                    gl.GL_PIXEL_UNPACK_BUFFER, size, None, gl.GL_STREAM_DRAW
+                )
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+
+    def _wait_pbo_fence(self, idx: int) -> None:
+        """Wait until the GPU has finished the last upload from PBO idx"""
+        fence = self.pbo_fences[idx]
+        if fence is not None:
+            # Timeout is in ns. This normally returns right away since the PBOs alternate.
+            gl.glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000_000)
+            gl.glDeleteSync(fence)
+            self.pbo_fences[idx] = None
+
+    def _delete_pbo_fences(self) -> None:
+        for idx, fence in enumerate(self.pbo_fences):
+            if fence is not None:
+                gl.glDeleteSync(fence)
+                self.pbo_fences[idx] = None
+
+    def _map_pbo(self, size: int) -> int:
+        """Map the currently bound PBO for writing. Returns the pointer.
+        The old contents are discarded so we never wait on a pending upload."""
+        if self.map_buffer_range:
+            flags = (
+                gl.GL_MAP_WRITE_BIT
+                | gl.GL_MAP_INVALIDATE_BUFFER_BIT
+                | gl.GL_MAP_UNSYNCHRONIZED_BIT
+            )
+            ptr = gl.glMapBufferRange(gl.GL_PIXEL_UNPACK_BUFFER, 0, size, flags)
+        else:
+            # GL 2.1 (e.g. the MacOS legacy context). Orphan the buffer then map it.
+            gl.glBufferData(gl.GL_PIXEL_UNPACK_BUFFER, size, None, gl.GL_STREAM_DRAW)
+            ptr = gl.glMapBuffer(gl.GL_PIXEL_UNPACK_BUFFER, gl.GL_WRITE_ONLY)
+        return int(ptr)
 
     def _render_gl(self, frame: NDArray[np.uint8]) -> None:
         """opengl portion of render"""
         gl.glClearColor(0.0, 0.0, 0.0, 1.0)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT)
-        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
 
-        # Prepare frame for opengl
-        frame = np.flipud(np.array(frame))
-        frame = np.ascontiguousarray(frame)
-
-        # Create and bind texture
-        texture = gl.glGenTextures(1)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
-
-        # Set texture parameters for scaling down/up
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
-
-        # Upload the image to texture
+        # Note, the frame is not flipped for opengl here. The texture coordinates
+        # in _QUAD_VERTICES take care of that.
+
+        # Copy the frame into the next PBO
+        pbo_idx = self.pbo_idx
+        self.pbo_idx = (pbo_idx + 1) % len(self.pbos)
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self.pbos[pbo_idx])
+        # copyto writes straight into the PBO memory. It handles non-contiguous
+        # frames (e.g., flipped views) without an intermediate contiguous copy.
+        if self.pbo_views:
+            # Already mapped. Just make sure the GPU isn't still reading it.
+            self._wait_pbo_fence(pbo_idx)
+            np.copyto(self.pbo_views[pbo_idx], frame)
+        else:
+            ptr = self._map_pbo(frame.nbytes)
+            np.copyto(_frame_view(ptr, frame.shape[0], frame.shape[1]), frame)
+            gl.glUnmapBuffer(gl.GL_PIXEL_UNPACK_BUFFER)
+
+        # Update the texture from the bound PBO. The data arg is an offset into the PBO.
         # shape = (height, width, channels)
         height = frame.shape[0]
         width = frame.shape[1]
-        gl.glTexImage2D(
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        gl.glTexSubImage2D(
             gl.GL_TEXTURE_2D,
             0,
-            gl.GL_RGB,
+            0,
+            0,
             width,
             height,
-            0,
             gl.GL_RGB,
             gl.GL_UNSIGNED_BYTE,
-            frame,
+            ctypes.c_void_p(0),
         )
+        if self.pbo_views:
+            self.pbo_fences[pbo_idx] = gl.glFenceSync(
+                gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0
+            )
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
 
-        # Enable texture mapping
-        gl.glEnable(gl.GL_TEXTURE_2D)
-
-        # Draw a quad (rectangle made of two triangles) that fills the screen
-        # The quad goes from -1 to 1 in both x and y (OpenGL normalized coordinates)
-        gl.glBegin(gl.GL_QUADS)
-        # For each vertex, set texture coordinate (0-1) and vertex position (-1 to 1)
-        gl.glTexCoord2f(0, 0)
-        gl.glVertex2f(-1, -1)
-        gl.glTexCoord2f(1, 0)
-        gl.glVertex2f(1, -1)
-        gl.glTexCoord2f(1, 1)
-        gl.glVertex2f(1, 1)
-        gl.glTexCoord2f(0, 1)
-        gl.glVertex2f(-1, 1)
-        gl.glEnd()
-
-        # Clean up
-        gl.glDisable(gl.GL_TEXTURE_2D)
-        gl.glDeleteTextures([texture])
+        # Draw the quad
+        gl.glUseProgram(self.program)
+        gl.glDrawArrays(gl.GL_TRIANGLE_STRIP, 0, len(_QUAD_VERTICES))
 
 
 class TestPattern:
@@ -257,12 +450,22 @@ class TestPattern:
         self.frequency = frequency
         self.step = 0
 
+        # Precompute one period of the color cycle. get_frame() indexes into it
+        # and fills the same frame buffer each time. Each entry is a full row
+        # because numpy fills a frame from a row much faster than from a
+        # single 3 byte color.
+        self.period = max(1, round(2 * np.pi / frequency))
+        colors = [self.cycle_spectrum(step, frequency) for step in range(self.period)]
+        self._rows = np.repeat(np.array(colors)[:, np.newaxis, :], width, axis=1)
+        self._frame = np.empty((height, width, 3), dtype=np.uint8)
+
     def get_frame(self) -> NDArray[np.uint8]:
-        # Create image with background color
-        color = self.cycle_spectrum(self.step, self.frequency)
-        frame = np.full((self.height, self.width, 3), color, dtype=np.uint8)
+        """Returns the next frame. Note, the same array is reused for every
+        frame. Copy it if you need to keep it."""
+        # Fill image with background color
+        self._frame[...] = self._rows[self.step % self.period]
         self.step += 1
-        return frame
+        return self._frame
 
     def sin(self, x: int, frequency: float, phase_shift: float) -> float:
         # sin from 0 to 255. phase shift is fraction of 2*pi.
@@ -1,5 +1,8 @@
 from typing import Literal
 
+import numpy as np
+from numpy.typing import NDArray
+
 from . import controller, gui, network
 
 
@@ -19,6 +22,8 @@ class GymLite:
         self.render_mode = render_mode
         self.mcio_mode = mcio_mode
         self.ctrl: controller.ControllerCommon | None = None
+        # Reused by render() so each step doesn't allocate a new frame
+        self._frame_buf: NDArray[np.uint8] | None = None
 
     def reset(self, commands: list[str] | None = None) -> network.ObservationPacket:
         if commands is None:
@@ -42,7 +47,10 @@ class GymLite:
 
     def render(self, observation: network.ObservationPacket) -> None:
         if self.render_mode == "human":
-            frame = observation.get_frame_with_cursor()
+            shape = (observation.frame_height, observation.frame_width, 3)
+            if self._frame_buf is None or self._frame_buf.shape != shape:
+                self._frame_buf = np.empty(shape, dtype=np.uint8)
+            frame = observation.get_frame_with_cursor(out=self._frame_buf)
             self.gui.show(frame)
 
     def step(self, action: network.ActionPacket) -> network.ObservationPacket:
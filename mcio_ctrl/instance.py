@@ -1,24 +1,32 @@
 """Interface for managing and launching Minecraft instances"""
 
+import json
 import logging
 import os
 import signal
 import subprocess
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from types import FrameType
 from typing import Any, Final
 
 import minecraft_launcher_lib as mll
-import requests
 
 from . import config, types, util
 
 LOG = logging.getLogger(__name__)
 
 INSTANCES_SUBDIR: Final[str] = "instances"
+CACHE_SUBDIR: Final[str] = "cache"
+# Modrinth version lists newer than this are used without checking the server
+MODRINTH_CACHE_TTL: Final[float] = 3600.0
 REQUIRED_MODS: Final[tuple[str, ...]] = ("fabric-api", "mcio")
+MODRINTH_VERSIONS_URL: Final[str] = (
+    "https://api.modrinth.com/v2/project/{mod_id}/version"
+)
+_MODRINTH_LOADERS: Final[str] = json.dumps(["fabric"])
 
 # XXX Rethink classes - Installer / Launcher / InstanceManager are confusing
 
@@ -48,6 +56,39 @@ class Installer:
                 )
 
     def install(self) -> None:
+        # Mods and the Fabric loader version only depend on mc_version, so fetch
+        # them in the background while Minecraft installs.
+        with ThreadPoolExecutor(max_workers=len(REQUIRED_MODS) + 1) as pool:
+            fabric_ver_future = pool.submit(mll.fabric.get_latest_loader_version)
+            mod_futures = [
+                pool.submit(
+                    install_mod,
+                    mod,
+                    self.instance_dir,
+                    self.mc_version,
+                    cache_dir=self.mcio_dir / CACHE_SUBDIR,
+                )
+                for mod in REQUIRED_MODS
+            ]
+            fabric_minecraft_version = self._install_minecraft(fabric_ver_future)
+            # Wait for the mods and raise any errors
+            for future in mod_futures:
+                future.result()
+
+        # Disable narrator
+        with util.OptionsTxt(self.instance_dir / "options.txt", save=True) as opts:
+            opts["narrator"] = "0"
+
+        with config.ConfigManager(self.mcio_dir, save=True) as cfg_mgr:
+            cfg_mgr.config.instances[self.instance_name] = config.InstanceConfig(
+                name=self.instance_name,
+                launch_version=fabric_minecraft_version,
+                minecraft_version=self.mc_version,
+            )
+        print("Success!")
+
+    def _install_minecraft(self, fabric_ver_future: Future[str]) -> str:
+        """Install Minecraft and Fabric. Returns the Fabric launch version"""
         print(f"Installing Minecraft {self.mc_version} in {self.instance_dir}...")
         progress = util.InstallProgress()
         # mll install uses more threads than connections, so urllib3 gives a warning.
@@ -74,7 +115,7 @@ class Installer:
 
         progress = util.InstallProgress()
         # XXX This doesn't check that the loader is compatible with the minecraft version
-        fabric_ver = mll.fabric.get_latest_loader_version()
+        fabric_ver = fabric_ver_future.result()
         mll.fabric.install_fabric(
             self.mc_version,
             self.instance_dir,
@@ -86,23 +127,7 @@ class Installer:
         # This is the format mll uses to generate the version string.
         # XXX Would prefer to get this automatically.
         fabric_minecraft_version = f"fabric-loader-{fabric_ver}-{self.mc_version}"
-
-        # Install mods
-        print()
-        for mod in REQUIRED_MODS:
-            install_mod(mod, self.instance_dir, self.mc_version)
-
-        # Disable narrator
-        with util.OptionsTxt(self.instance_dir / "options.txt", save=True) as opts:
-            opts["narrator"] = "0"
-
-        with config.ConfigManager(self.mcio_dir, save=True) as cfg_mgr:
-            cfg_mgr.config.instances[self.instance_name] = config.InstanceConfig(
-                name=self.instance_name,
-                launch_version=fabric_minecraft_version,
-                minecraft_version=self.mc_version,
-            )
-        print("Success!")
+        return fabric_minecraft_version
 
 
 class Launcher:
@@ -230,20 +255,17 @@ class Launcher:
         return cmd
 
     def _get_env(self) -> dict[str, str]:
-        env = os.environ.copy()
-        env.update(self.run_options.env_vars)
-        return env
+        return {**os.environ, **self.run_options.env_vars}
 
     def _update_option_argument(
         self, command_list: list[str], option: str, new_argument: str
     ) -> list[str]:
         """Find the specified option in the command list and replace the value
-        after it with new_argument"""
+        after it with new_argument. Modifies command_list in place and returns it."""
         try:
-            new_list = command_list.copy()
-            option_index = new_list.index(option)
-            new_list[option_index + 1] = new_argument
-            return new_list
+            option_index = command_list.index(option)
+            command_list[option_index + 1] = new_argument
+            return command_list
         except ValueError:
             print(f"Option {option} not found in command list")
             raise
@@ -300,7 +322,9 @@ class InstanceManager:
 
     def get_instance_world_list(self, instance_name: config.InstanceName) -> list[str]:
         world_dir = self.get_saves_dir(instance_name)
-        world_names = [x.name for x in world_dir.iterdir() if x.is_dir()]
+        # scandir gets the entry type from the directory listing, so no stat per world
+        with os.scandir(world_dir) as entries:
+            world_names = [e.name for e in entries if e.is_dir()]
         return world_names
 
     def install_mod(self, instance_name: config.InstanceName, mod_id: str) -> None:
@@ -312,7 +336,7 @@ class InstanceManager:
             raise ValueError(f"Instance {instance_name} not found in {cm.config_file}")
         mc_ver = instance_config.minecraft_version
 
-        install_mod(mod_id, inst_dir, mc_ver)
+        install_mod(mod_id, inst_dir, mc_ver, cache_dir=self.mcio_dir / CACHE_SUBDIR)
 
     def copy(
         self,
@@ -338,13 +362,11 @@ def install_mod(
     instance_dir: Path,
     mc_ver: str,
     version_type: str = "release",
+    cache_dir: Path | None = None,
 ) -> None:
     """Install a mod in the specified instance. Uses the modrinth api to find a
-    compatible match."""
-    mod_info_url = f'https://api.modrinth.com/v2/project/{mod_id}/version?game_versions=["{mc_ver}"]&loaders=["fabric"]'
-    response = requests.get(mod_info_url)
-    response.raise_for_status()
-    info_list: list[Any] = response.json()
+    compatible match. If cache_dir is set, the modrinth version list is cached there."""
+    info_list = _get_mod_versions(mod_id, mc_ver, cache_dir)
 
     found: dict[str, Any] | None = None
     for vers_info in info_list:
@@ -358,12 +380,51 @@ def install_mod(
         )
     # Is the jar always the first in the "files" list?
     jar_info = found["files"][0]
-    response = requests.get(jar_info["url"])
-    response.raise_for_status()
     filename = jar_info["filename"]
 
     mods_dir = instance_dir / "mods"
     mods_dir.mkdir(parents=True, exist_ok=True)
     print(f"Installing {filename}")
-    with open(mods_dir / filename, "wb") as f:
-        f.write(response.content)
+    util.download_file(jar_info["url"], mods_dir / filename)
+
+
+def _get_mod_versions(
+    mod_id: str, mc_ver: str, cache_dir: Path | None = None
+) -> list[Any]:
+    """Get the modrinth version list for mod_id that supports mc_ver with fabric.
+    With cache_dir, entries newer than MODRINTH_CACHE_TTL are used without a request.
+    Older entries are revalidated with their ETag."""
+    mod_info_url = MODRINTH_VERSIONS_URL.format(mod_id=mod_id)
+    # Let requests do the quoting
+    params = {"game_versions": json.dumps([mc_ver]), "loaders": _MODRINTH_LOADERS}
+
+    cache_file: Path | None = None
+    cached: dict[str, Any] | None = None
+    headers: dict[str, str] = {}
+    if cache_dir is not None:
+        cache_file = cache_dir / f"modrinth-{mod_id}-{mc_ver}.json"
+        try:
+            with cache_file.open() as f:
+                cached = json.load(f)
+            cache_age = time.time() - cache_file.stat().st_mtime
+        except (OSError, ValueError):
+            cached = None  # Missing or unreadable. Fetch it.
+        if cached is not None:
+            if cache_age < MODRINTH_CACHE_TTL:
+                return list(cached["versions"])
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+
+    response = util.http_session().get(mod_info_url, params=params, headers=headers)
+    if response.status_code == 304 and cache_file is not None and cached is not None:
+        # Not modified. Restart the TTL.
+        cache_file.touch()
+        return list(cached["versions"])
+    response.raise_for_status()
+    info_list: list[Any] = response.json()
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with cache_file.open("w") as f:
+            json.dump({"etag": response.headers.get("ETag"), "versions": info_list}, f)
+    return info_list
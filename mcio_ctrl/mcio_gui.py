@@ -30,10 +30,22 @@ class MCioGUI:
         self.running = True
         self.gui: gui.ImageStreamGui | None = None
         self.gui = gui.ImageStreamGui(name, scale=scale, width=800, height=600)
+        # Wake run() from waiting on window events when an observation arrives.
+        # post_empty_event() is safe to call from the observation thread.
         self.controller = controller.ControllerAsync(
-            action_port=action_port, observation_port=observation_port
+            action_port=action_port,
+            observation_port=observation_port,
+            observation_callback=lambda _: glfw.post_empty_event(),
+            # Decode frames in the observation thread so it overlaps with GL work here
+            decode_frames=True,
+            cursor_drawer=cursor_drawer,
         )
         self.cursor_drawer = cursor_drawer
+        # Input collected by the callbacks. Sent as one action per frame. See _send_pending().
+        self._pending_inputs: list[types.InputEvent] = []
+        # Only the latest cursor position is kept.
+        self._cursor_pos: tuple[int, int] | None = None
+        self._sent_cursor_pos: tuple[int, int] | None = None
 
         # Set callbacks. Defaults are good enough for resize and focus.
         self.gui.set_callbacks(
@@ -56,27 +68,40 @@ class MCioGUI:
 
         # Pass everything else to Minecraft
         input = types.InputEvent.from_ints(types.InputType.KEY, key, action)
-        action_pkt = network.ActionPacket(inputs=[input])
-        self.controller.send_action(action_pkt)
+        self._pending_inputs.append(input)
 
     def cursor_position_callback(self, window: Any, xpos: float, ypos: float) -> None:
-        """Handle mouse movement. Only watch the mouse when we're focused."""
+        """Handle mouse movement. Only watch the mouse when we're focused.
+        Only the latest position is kept. It's sent once per frame by run()."""
         assert self.gui is not None
         if self.gui.is_focused:
             # If we're scaling the window, also scale the position so things line up
             # XXX If the user manually resizes the window, the scaling goes out of whack.
             # Need to change the scale based on actual window size vs frame size
-            scaled_pos = (int(xpos / self.scale), int(ypos / self.scale))
-            action = network.ActionPacket(cursor_pos=[scaled_pos])
+            self._cursor_pos = (int(xpos / self.scale), int(ypos / self.scale))
+
+    def _send_pending(self) -> None:
+        """Send the input collected since the last send as a single action"""
+        if self._cursor_pos == self._sent_cursor_pos:
+            # Moved within the same scaled pixel. Nothing new to send.
+            self._cursor_pos = None
+        if self._pending_inputs or self._cursor_pos is not None:
+            action = network.ActionPacket(
+                inputs=self._pending_inputs,
+                cursor_pos=[self._cursor_pos] if self._cursor_pos is not None else [],
+            )
             self.controller.send_action(action)
+            if self._cursor_pos is not None:
+                self._sent_cursor_pos = self._cursor_pos
+            self._pending_inputs = []
+            self._cursor_pos = None
 
     def mouse_button_callback(
         self, window: Any, button: int, action: int, mods: int
     ) -> None:
         """Handle mouse button events"""
         input = types.InputEvent.from_ints(types.InputType.MOUSE, button, action)
-        action_pkt = network.ActionPacket(inputs=[input])
-        self.controller.send_action(action_pkt)
+        self._pending_inputs.append(input)
 
     def show(self, observation: network.ObservationPacket) -> None:
         """Show frame to the user"""
@@ -95,18 +120,31 @@ class MCioGUI:
         frame_time = 1.0 / self.fps
         fps_track = util.TrackPerSecond("FPS")
         while self.running:
-            frame_start = time.perf_counter()
             try:
                 observation = self.controller.recv_observation(block=False)
             except queue.Empty:
-                # No new frame. Just poll gui and continue.
-                pass
+                # No new frame. Handle input events until one arrives. The
+                # controller's observation_callback interrupts the wait. The
+                # timeout just keeps the launcher check going.
+                self.gui.poll(timeout=frame_time)
             else:
-                LOG.debug(observation)
+                frame_start = time.perf_counter()
+                if LOG.isEnabledFor(logging.DEBUG):
+                    LOG.debug(observation)
                 self.show(observation)
-
-            # Always poll. This keeps the window from being frozen.
-            self.gui.poll()
+                fps_track.count()
+                # Always poll. This keeps the window from being frozen.
+                # Then handle input events until the next frame is allowed (fps limit).
+                self.gui.poll()
+                frame_end = frame_start + frame_time
+                while (
+                    self.running and (remaining := frame_end - time.perf_counter()) > 0
+                ):
+                    self.gui.poll(timeout=remaining)
+
+            # Send everything from this frame in one action. A fast mouse can
+            # generate many position events per frame. Only the latest is sent.
+            self._send_pending()
 
             if launcher is not None:
                 ret = launcher.poll()
@@ -114,13 +152,6 @@ class MCioGUI:
                     # Minecraft exited
                     self.running = False
 
-            # Calculate sleep time to maintain target FPS
-            elapsed = time.perf_counter() - frame_start
-            sleep_time = max(0, frame_time - elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            fps_track.count()
-
         # Cleanup
         LOG.info("Exiting...")
         self.close()
@@ -4,7 +4,7 @@ import logging
 import pprint
 import threading
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from typing import Final, Union
 
 import cbor2
@@ -20,9 +20,20 @@ LOG = logging.getLogger(__name__)
 
 MCIO_PROTOCOL_VERSION: Final[int] = 5
 
+# How often the monitor thread checks for shutdown
+MONITOR_POLL_MS: Final[int] = 100
+# Max time send_stop() waits for Minecraft to receive the stop and disconnect
+STOP_WAIT: Final[float] = 0.5
+# Unsent actions are dropped this long after the action socket is closed
+ACTION_LINGER_MS: Final[int] = 500
+
+# Bound once. pack/unpack run for every packet.
+_cbor_dumps = cbor2.dumps
+_cbor_loads = cbor2.loads
+
 
 # Observation packets received from MCio
-@dataclass
+@dataclass(slots=True)
 class ObservationPacket:
     ## Control ##
     version: int = MCIO_PROTOCOL_VERSION
@@ -51,16 +62,26 @@ class ObservationPacket:
     inventory_armor: list[types.InventorySlot] = field(default_factory=list)
     inventory_offhand: list[types.InventorySlot] = field(default_factory=list)
 
+    # Not part of the packet. Set by cache_frame_with_cursor().
+    _frame_cache: NDArray[np.uint8] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def unpack(cls, data: bytes) -> Union["ObservationPacket", None]:
         try:
-            decoded_dict = cbor2.loads(data)
+            decoded_dict = _cbor_loads(data)
         except Exception as e:
             LOG.error(f"CBOR load error: {type(e).__name__}: {e}")
             return None
 
         try:
-            obs = cls(**decoded_dict)
+            if len(decoded_dict) == len(_OBSERVATION_FIELDS):
+                # Normal case. Positional args skip the kwarg matching in __init__.
+                # A renamed field raises KeyError and is reported below.
+                obs = cls(*[decoded_dict[name] for name in _OBSERVATION_FIELDS])
+            else:
+                obs = cls(**decoded_dict)
         except Exception as e:
             # This means the received packet doesn't match ObservationPacket.
             # It may not even be a dict.
@@ -81,39 +102,79 @@ class ObservationPacket:
 
     def pack(self) -> bytes:
         """For testing"""
-        pkt_dict = asdict(self)
+        # Shallow. asdict() would deep copy the frame and _frame_cache.
+        pkt_dict = {name: getattr(self, name) for name in _OBSERVATION_FIELDS}
+        for name in ("inventory_main", "inventory_armor", "inventory_offhand"):
+            # Received packets hold dicts, locally built ones may hold InventorySlots
+            pkt_dict[name] = [
+                asdict(slot) if isinstance(slot, types.InventorySlot) else slot
+                for slot in pkt_dict[name]
+            ]
         LOG.debug(pkt_dict)
-        return cbor2.dumps(pkt_dict)
+        return _cbor_dumps(pkt_dict)
 
     def __str__(self) -> str:
         # frame is excluded from repr. Add its shape to str.
         return f"{repr(self)} frame.shape=({self.frame_height}, {self.frame_width})"
 
-    def get_frame_type(self) -> str | None:
-        return self.frame_type  # "PNG" / "JPEG" / "RAW"
+    def get_frame_type(self) -> types.FrameType:
+        return self.frame_type  # Currently always RAW (uncompressed RGB)
 
     def get_frame_with_cursor(
-        self, cursor_drawer: util.CursorDrawer | None = None
+        self,
+        cursor_drawer: util.CursorDrawer | None = None,
+        out: NDArray[np.uint8] | None = None,
     ) -> NDArray[np.uint8]:
+        """Return the frame as a (height, width, 3) RGB array with the cursor drawn if visible.
+        If out is passed the frame is written into it and out is returned. This lets callers
+        reuse one buffer across steps instead of allocating a new frame each time.
+        If the frame was cached by cache_frame_with_cursor() the cached frame is returned
+        (or copied to out) and cursor_drawer is ignored."""
+        if self._frame_cache is not None:
+            if out is None:
+                return self._frame_cache
+            np.copyto(out, self._frame_cache)
+            return out
+
         frame: NDArray[np.uint8]
         match self.frame_type:
             case types.FrameType.RAW:
                 frame = np.frombuffer(self.frame, dtype=np.uint8)
                 frame = frame.reshape((self.frame_height, self.frame_width, 3))
                 frame = np.flipud(frame)
+                if out is not None:
+                    np.copyto(out, frame)
+                    frame = out
                 if self.cursor_mode == glfw.CURSOR_NORMAL:
                     if cursor_drawer is None:
                         cursor_drawer = util.DEFAULT_CURSOR_DRAWER
-                    frame = frame.copy()  # The buffer from cbor is not writable
+                    if out is None:
+                        frame = frame.copy()  # The buffer from cbor is not writable
                     cursor_drawer.draw_cursor(frame, self.cursor_pos)
             case _:
                 raise ValueError(f"Invalid frame_type: {self.frame_type}")
 
+        if out is not None:
+            return out
         return np.ascontiguousarray(frame)
 
+    def cache_frame_with_cursor(
+        self, cursor_drawer: util.CursorDrawer | None = None
+    ) -> None:
+        """Decode the frame now and keep it for later get_frame_with_cursor() calls.
+        ControllerAsync uses this to do the decode in its observation thread."""
+        self._frame_cache = None
+        self._frame_cache = self.get_frame_with_cursor(cursor_drawer)
+
+
+# __init__ argument order for ObservationPacket.unpack()
+_OBSERVATION_FIELDS: Final[tuple[str, ...]] = tuple(
+    f.name for f in fields(ObservationPacket) if f.init
+)
+
 
 # Action packets sent by the agent to MCio
-@dataclass
+@dataclass(slots=True)
 class ActionPacket:
     ## Control ##
     version: int = MCIO_PROTOCOL_VERSION
@@ -136,14 +197,28 @@ class ActionPacket:
     cursor_pos: list[tuple[float, float]] = field(default_factory=list)
 
     def pack(self) -> bytes:
-        pkt_dict = asdict(self)
-        LOG.debug(pkt_dict)
-        return cbor2.dumps(pkt_dict)
+        # Built by hand instead of asdict(), which deep copies every field.
+        # Must match the asdict() layout. See test_action_pack_matches_asdict.
+        pkt_dict = {
+            "version": self.version,
+            "sequence": self.sequence,
+            "commands": self.commands,
+            "clear_input": self.clear_input,
+            "stop": self.stop,
+            "inputs": [
+                {"type": ev.type, "code": ev.code, "action": ev.action}
+                for ev in self.inputs
+            ],
+            "cursor_pos": self.cursor_pos,
+        }
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug(pkt_dict)
+        return _cbor_dumps(pkt_dict)
 
     @classmethod
     def unpack(cls, data: bytes) -> "ActionPacket":
         """For testing"""
-        decoded_dict = cbor2.loads(data)
+        decoded_dict = _cbor_loads(data)
         return cls(**decoded_dict)
 
 
@@ -160,27 +235,35 @@ class _Connection:
         connection_timeout: (
             float | None
         ) = None,  # Only used when wait_for_connection is True
+        conflate: bool = False,  # Only keep the newest unread observation
     ) -> None:
         action_port = action_port or types.DEFAULT_ACTION_PORT
         observation_port = observation_port or types.DEFAULT_OBSERVATION_PORT
 
         LOG.info("Connecting to Minecraft")
-        # Initialize ZMQ context
-        self.zmq_context = zmq.Context()
+        # Process-wide ZMQ context. Shared by all connections, never terminated here.
+        self.zmq_context: zmq.SyncContext = zmq.Context.instance()
 
         # Socket to send commands
         self.action_socket = self.zmq_context.socket(zmq.PUSH)
+        self.action_socket.setsockopt(zmq.LINGER, ACTION_LINGER_MS)
         action_monitor = self.action_socket.get_monitor_socket()
         self.action_socket.connect(f"tcp://{types.DEFAULT_HOST}:{action_port}")
         self.action_connected = threading.Event()
 
         # Socket to receive observation updates
         self.observation_socket = self.zmq_context.socket(zmq.PULL)
+        if conflate:
+            # zmq drops older queued observations itself. Must be set before connect.
+            self.observation_socket.setsockopt(zmq.CONFLATE, 1)
         observation_monitor = self.observation_socket.get_monitor_socket()
         self.observation_socket.connect(
             f"tcp://{types.DEFAULT_HOST}:{observation_port}"
         )
         self.observation_connected = threading.Event()
+        # Reused by recv_observation(). socket.poll() creates a new Poller each call.
+        self._observation_poller = zmq.Poller()
+        self._observation_poller.register(self.observation_socket, zmq.POLLIN)
 
         # Start monitor thread
         self._running = threading.Event()
@@ -233,6 +316,8 @@ class _Connection:
         while self._running.is_set():
             try:
                 # RECV 1
+                # Not using copy=False. cbor2.loads() is about 2x slower on a
+                # memoryview than on bytes, which costs more than the copy saves.
                 pbytes = self.observation_socket.recv(zmq.DONTWAIT)
             except zmq.ContextTerminated:
                 # Shutting down
@@ -245,17 +330,23 @@ class _Connection:
                 # prevents a clean exit when self._running is cleared.
                 # Do a short poll so we're not busy waiting then try again.
                 try:
-                    self.observation_socket.poll(10, zmq.POLLIN)
+                    self._observation_poller.poll(10)
                 except zmq.error.ZMQError:
                     # This can happen on close because the main thread closes the socket.
                     pass
+            except zmq.ZMQError:
+                # Socket closed by close() while we were in recv
+                if self._running.is_set():
+                    raise
+                return None
             else:
                 # recv returned
                 # This may also return None if there was an unpack error.
                 observation = ObservationPacket.unpack(pbytes)
                 self._last_observation_pkt = observation
                 self.recv_counter.count()
-                LOG.debug(observation)
+                if LOG.isEnabledFor(logging.DEBUG):
+                    LOG.debug(observation)
                 return observation
 
         # Loop exited
@@ -265,16 +356,20 @@ class _Connection:
         """Send a stop packet to Minecraft. This should cause Minecraft to cleanly exit."""
         LOG.info("Sending-Stop")
         self.send_action(ActionPacket(stop=True))
-        # Give Minecraft a chance to receive the packet before closing the connection. Seems like
-        # ZMQ should handle this.
-        time.sleep(0.5)
+        # Give Minecraft a chance to receive the packet before closing the connection.
+        # Minecraft drops the connection when it exits, so stop waiting once the
+        # monitor thread sees that.
+        deadline = time.monotonic() + STOP_WAIT
+        while self.action_connected.is_set() and time.monotonic() < deadline:
+            time.sleep(0.01)
 
     def close(self) -> None:
         LOG.info("Closing-Connections")
         self._running.clear()
         self.action_socket.close()
         self.observation_socket.close()
-        self.zmq_context.term()
+        # The context is shared (zmq.Context.instance()) so don't term it.
+        # The monitor thread sees _running cleared on its next poll timeout.
 
     def _wait_for_connections(self, connection_timeout: float | None = None) -> bool:
         start = time.time()
@@ -334,7 +429,9 @@ class _Connection:
             # Only care about socket here since the only event
             # we're listening for is POLLIN.
             try:
-                poll_events = dict(poller.poll())
+                # Timeout so the thread notices close(). The shared context
+                # isn't terminated, so ContextTerminated won't wake us.
+                poll_events = dict(poller.poll(MONITOR_POLL_MS))
             except zmq.ContextTerminated:
                 break  # exiting
 
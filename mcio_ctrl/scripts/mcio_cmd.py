@@ -5,7 +5,10 @@ import textwrap
 from pathlib import Path
 from typing import Any, Final, Protocol
 
-from mcio_ctrl import config, instance, mcio_gui, types, util, world
+from mcio_ctrl import config, types, util
+
+# instance, mcio_gui and world are slow to import, so the run() methods that
+# need them import them. Parsing args and --help don't pay for them.
 
 LOG = logging.getLogger(__name__)
 
@@ -23,9 +26,6 @@ def _add_mcio_dir_arg(parser: argparse.ArgumentParser) -> None:
 class Cmd(Protocol):
     CMD: str
 
-    def cmd(self) -> str:
-        return self.CMD
-
     def run(self, args: argparse.Namespace) -> None: ...
     def add(self, parent_subparsers: "argparse._SubParsersAction[Any]") -> None: ...
 
@@ -54,6 +54,8 @@ class WorldCmd(Cmd):
     CMD = "world"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import world
+
         wm = world.WorldManager(mcio_dir=args.mcio_dir)
         if args.world_command == "cp":
             wm.copy_cmd(args.src, args.dst)
@@ -135,6 +137,8 @@ class GuiCmd(Cmd):
     CMD = "gui"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import mcio_gui
+
         gui = mcio_gui.MCioGUI(
             scale=args.scale,
             fps=args.fps,
@@ -181,6 +185,8 @@ class InstanceLaunchCmd(Cmd):
     CMD = "launch"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import instance
+
         env_extra = {"MCIO_HELP": "TRUE"} if args.mcio_help else None
         opts = types.RunOptions(
             instance_name=args.instance_name,
@@ -265,6 +271,8 @@ class InstanceInstallCmd(Cmd):
     CMD = "install"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import instance
+
         installer = instance.Installer(
             args.instance_name,
             args.mcio_dir,
@@ -303,6 +311,8 @@ class InstanceCpCmd(Cmd):
     CMD = "cp"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import instance
+
         im = instance.InstanceManager(args.mcio_dir)
         im.copy(args.src, args.dst)
 
@@ -327,6 +337,8 @@ class InstanceRmCmd(Cmd):
     CMD = "rm"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import instance
+
         im = instance.InstanceManager(args.mcio_dir)
         im.delete(args.instance_name)
 
@@ -345,6 +357,8 @@ class InstanceModCmd(Cmd):
     CMD = "mod"
 
     def run(self, args: argparse.Namespace) -> None:
+        from mcio_ctrl import instance
+
         im = instance.InstanceManager(args.mcio_dir)
         im.install_mod(args.instance_name, args.mod_id)
 
@@ -367,12 +381,16 @@ class InstanceModCmd(Cmd):
 
 class InstanceCmd(Cmd):
     CMD = "inst"
+    SUBCOMMANDS: Final[tuple[type[Cmd], ...]] = (
+        InstanceInstallCmd,
+        InstanceModCmd,
+        InstanceLaunchCmd,
+        InstanceCpCmd,
+        InstanceRmCmd,
+    )
 
     def run(self, args: argparse.Namespace) -> None:
-        for cmd in self.cmd_objects:
-            if args.instance_command == cmd.cmd():
-                cmd.run(args)
-                return
+        self.cmd_table[args.instance_command].run(args)
 
     def add(self, parent_subparsers: "argparse._SubParsersAction[Any]") -> None:
         instance_parser = parent_subparsers.add_parser(
@@ -382,15 +400,10 @@ class InstanceCmd(Cmd):
             dest="instance_command", metavar="instance-command", required=True
         )
 
-        self.cmd_objects: list[Any] = [
-            InstanceInstallCmd(),
-            InstanceModCmd(),
-            InstanceLaunchCmd(),
-            InstanceCpCmd(),
-            InstanceRmCmd(),
-        ]
-
-        for cmd in self.cmd_objects:
+        self.cmd_table: dict[str, Cmd] = {
+            cmd_cls.CMD: cmd_cls() for cmd_cls in self.SUBCOMMANDS
+        }
+        for cmd in self.cmd_table.values():
             cmd.add(subparsers)
 
 
@@ -402,6 +415,8 @@ class DemoCmd(Cmd):
 
     def run(self, args: argparse.Namespace) -> None:
         """See 1-6 in add() for an explaination"""
+        from mcio_ctrl import instance, mcio_gui, world
+
         im = instance.InstanceManager(args.mcio_dir)
 
         # 1 and 2
@@ -471,7 +486,18 @@ class DemoCmd(Cmd):
         _add_mcio_dir_arg(demo_parser)
 
 
-def base_parse_args() -> tuple[argparse.Namespace, list[Any]]:
+# Top-level commands, in help order
+COMMANDS: Final[tuple[type[Cmd], ...]] = (
+    InstanceCmd,
+    WorldCmd,
+    ShowCmd,
+    GuiCmd,
+    DemoCmd,
+)
+
+
+def base_parse_args() -> tuple[argparse.Namespace, dict[str, Cmd]]:
+    """Returns the parsed args and a table of command name -> command object"""
     parser = argparse.ArgumentParser(
         description="Minecraft Instance Manager and Launcher"
     )
@@ -480,33 +506,26 @@ def base_parse_args() -> tuple[argparse.Namespace, list[Any]]:
     # Subparsers for different modes
     subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
 
-    cmd_objects: list[Any] = [
-        InstanceCmd(),
-        WorldCmd(),
-        ShowCmd(),
-        GuiCmd(),
-        DemoCmd(),
-    ]
-
-    for cmd in cmd_objects:
+    cmd_table: dict[str, Cmd] = {cmd_cls.CMD: cmd_cls() for cmd_cls in COMMANDS}
+    for cmd in cmd_table.values():
         cmd.add(subparsers)
 
     args = parser.parse_args()
     util.logging_init(args=args)
-    return args, cmd_objects
+    return args, cmd_table
 
 
-def base_run(args: argparse.Namespace, cmd_objects: list[Any]) -> None:
-    for cmd in cmd_objects:
-        if args.command == cmd.cmd():
-            cmd.run(args)
-            return
-    print(f"Unknown command: {args.command}")
+def base_run(args: argparse.Namespace, cmd_table: dict[str, Cmd]) -> None:
+    cmd = cmd_table.get(args.command)
+    if cmd is None:
+        print(f"Unknown command: {args.command}")
+        return
+    cmd.run(args)
 
 
 def main() -> None:
-    args, cmd_objects = base_parse_args()
-    base_run(args, cmd_objects)
+    args, cmd_table = base_parse_args()
+    base_run(args, cmd_table)
 
 
 if __name__ == "__main__":
@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import Final
 
 import minecraft_launcher_lib as mll
-import requests
 
 from . import config, util
 
@@ -39,11 +38,7 @@ class Server:
         server_url = info["downloads"]["server"]["url"]
         server_jvm_version = info["javaVersion"]["component"]
 
-        response = requests.get(server_url)
-        response.raise_for_status()
-
-        with open(self.server_version_dir / "server.jar", "wb") as f:
-            f.write(response.content)
+        util.download_file(server_url, self.server_version_dir / "server.jar")
         self._write_eula()
 
         print("Install server java runtime")
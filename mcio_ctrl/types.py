@@ -1,6 +1,7 @@
 """Defines some common types for the module"""
 
 import enum
+import functools
 import os
 import uuid
 from dataclasses import dataclass
@@ -8,8 +9,6 @@ from importlib import resources
 from pathlib import Path
 from typing import Final, Self, Type, TypeVar, cast
 
-import glfw  # type: ignore
-
 from . import config
 
 # Project defines
@@ -25,24 +24,12 @@ DEFAULT_HIDE_WINDOW = False
 RESOURCES_DIR = resources.files() / "resources"
 
 
-class StrEnumUpper(enum.StrEnum):
-    """Like StrEnum, but the values are same as the enum rather than lowercase."""
-
-    # XXX Wait, why do we need this? Could just use Enum["FOO"] / Enum.FOO.name
-
-    @staticmethod
-    def _generate_next_value_(
-        name: str, start: int, count: int, last_values: list[str]
-    ) -> str:
-        return name
+class MCioMode(enum.StrEnum):
+    """MCio Mode. Values match the names, which is what MCio sends."""
 
-
-class MCioMode(StrEnumUpper):
-    """MCio Mode"""
-
-    OFF = enum.auto()
-    ASYNC = enum.auto()
-    SYNC = enum.auto()
+    OFF = "OFF"
+    ASYNC = "ASYNC"
+    SYNC = "SYNC"
 
 
 DEFAULT_MCIO_MODE: Final[MCioMode] = MCioMode.ASYNC
@@ -52,10 +39,10 @@ DEFAULT_MCIO_MODE: Final[MCioMode] = MCioMode.ASYNC
 # Protocol types
 
 
-class FrameType(StrEnumUpper):
+class FrameType(enum.StrEnum):
     """Observation frame type. Currently just RAW."""
 
-    RAW = enum.auto()
+    RAW = "RAW"
 
 
 @dataclass
@@ -82,12 +69,14 @@ type GlfwCode = int
 
 
 class GlfwAction(enum.IntEnum):
-    RELEASE = glfw.RELEASE
-    PRESS = glfw.PRESS
+    # Same values as glfw.RELEASE / glfw.PRESS. Hardcoded so importing types
+    # doesn't load the glfw library.
+    RELEASE = 0
+    PRESS = 1
     # Note, not using glfw.REPEAT
 
 
-@dataclass(frozen=True)  # Hashable
+@dataclass(frozen=True, slots=True)  # Hashable
 class InputID:
     type: InputType
     code: GlfwCode
@@ -97,7 +86,7 @@ class InputID:
         return cls(type=InputType(type_int), code=code)
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class InputEvent:
     """Full input event sent to Minecraft"""
 
@@ -131,6 +120,12 @@ UNSET: Final = _UnsetType()
 T = TypeVar("T")
 
 
+@functools.lru_cache(maxsize=128)
+def _username_uuid(mc_username: str) -> uuid.UUID:
+    """Minecraft UUID for a local username. Always the same for a given name."""
+    return uuid.uuid5(uuid.NAMESPACE_URL, mc_username)
+
+
 class RunOptions:
     """
     ## Options for running Minecraft
@@ -243,14 +238,14 @@ class RunOptions:
             _mlc = str(Path(_mlc).resolve())
         self.mcio_log_cfg: str | None = _mlc
 
-        # Auto-generated
-        self.instance_dir: Path | None = self._instance_dir()
-        self.mc_uuid = uuid.uuid5(uuid.NAMESPACE_URL, self.mc_username)
-
         # Copy env_extra. These will override any set by arguments or env vars.
         self.env_vars.update(env_extra or {})
 
-    def _instance_dir(self) -> Path | None:
+    ##
+    # Auto-generated. Computed on first use.
+
+    @functools.cached_property
+    def instance_dir(self) -> Path | None:
         if self.instance_name is None:
             return None
 
@@ -259,6 +254,10 @@ class RunOptions:
         im = instance.InstanceManager(self.mcio_dir)
         return im.get_instance_dir(self.instance_name)
 
+    @functools.cached_property
+    def mc_uuid(self) -> uuid.UUID:
+        return _username_uuid(self.mc_username)
+
     def _resolve(
         self,
         typ: Type[T],
@@ -1,11 +1,13 @@
 import argparse
 import logging
+import os
 import queue
 import shutil
+import threading
 import time
 import types
 from pathlib import Path
-from typing import Any, Literal, Protocol, TypeVar
+from typing import Any, Literal, Protocol, cast
 
 import minecraft_launcher_lib as mll
 import numpy as np
@@ -96,7 +98,9 @@ class MinerlCursor(CursorDrawer):
         cursor_file = mcio_types.RESOURCES_DIR / self.MINERL_CURSOR_FILE
         with cursor_file.open("rb") as f:
             cursor_data = np.load(f)
+        # Precompute the parts of the blend that don't depend on the frame.
         self.cursor_alpha = cursor_data[:16, :16, 3:] / 255.0
+        self.cursor_inv_alpha = 1 - self.cursor_alpha
         self.cursor_image = cursor_data[:16, :16, :3] * self.cursor_alpha
 
     def draw_cursor(
@@ -111,16 +115,19 @@ class MinerlCursor(CursorDrawer):
         if x < 0 or x >= w or y < 0 or y >= h:
             return  # Cursor out of frame
 
-        ch = min(h - y, self.cursor_image.shape[0])
-        cw = min(w - x, self.cursor_image.shape[1])
+        ch, cw = self.cursor_image.shape[:2]
+        inv_alpha, image = self.cursor_inv_alpha, self.cursor_image
+        if y + ch > h or x + cw > w:
+            # Cursor is partly off the frame. Crop it.
+            ch = min(h - y, ch)
+            cw = min(w - x, cw)
+            inv_alpha, image = inv_alpha[:ch, :cw], image[:ch, :cw]
 
+        # Blend in place with one temporary. The unsafe cast truncates like astype().
         background = frame[y : y + ch, x : x + cw]
-        cropped_alpha = self.cursor_alpha[:ch, :cw]
-        cropped_image = self.cursor_image[:ch, :cw]
-
-        frame[y : y + ch, x : x + cw] = (
-            background * (1 - cropped_alpha) + cropped_image
-        ).astype(frame.dtype)
+        blended = background * inv_alpha
+        blended += image
+        np.copyto(background, blended, casting="unsafe")
 
 
 class CrosshairCursor(CursorDrawer):
@@ -158,46 +165,49 @@ DEFAULT_CURSOR_DRAWER = MinerlCursor()
 ##
 # LatestItemQueue
 
-T = TypeVar("T")
-
 
-class LatestItemQueue(queue.Queue[T]):
+class LatestItemQueue[T]:
     """
-    Threadsafe Queue that only saves the most recent item.
+    Threadsafe single-slot queue that only saves the most recent item.
     Puts replace any item on the queue.
+    Like queue.Queue(maxsize=1), but a put is one lock acquisition instead of a
+    get_nowait() + put(), and there's no task_done() bookkeeping.
     """
 
     def __init__(self) -> None:
-        super().__init__(maxsize=1)
+        self._item: T | None = None
+        self._has_item = False
+        self._cond = threading.Condition()
 
-    def put(self, item: T) -> bool:  # type: ignore[override]
+    def put(self, item: T) -> bool:
         """Return True if the previous packet had to be dropped"""
-        dropped = False
-        try:
-            # Discard the current item if the queue isn't empty
-            self.get_nowait()
-            dropped = True
-        except queue.Empty:
-            pass
-
-        super().put(item)
+        with self._cond:
+            dropped = self._has_item
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
         return dropped
 
     def get(self, block: bool = True, timeout: float | None = None) -> T:
         """
-        The same as Queue.get, except this automatically calls task_done()
-        I'm not sure task_done() really matters for how we're using Queue.
+        The same as Queue.get.
         Can raise queue.Empty if non-blocking or timeout
         """
-        item = super().get(block=block, timeout=timeout)
-        super().task_done()
+        with self._cond:
+            if not self._has_item and not (
+                block and self._cond.wait_for(lambda: self._has_item, timeout)
+            ):
+                raise queue.Empty
+            item = cast(T, self._item)
+            self._item = None
+            self._has_item = False
         return item
 
 
 class TrackPerSecond:
     def __init__(self, name: str, log_time: float | None = 10.0):
         self.name = name
-        self.start = time.time()
+        self.start = time.monotonic()
         self.end = self.start
         self.item_count = 0
 
@@ -207,7 +217,7 @@ class TrackPerSecond:
 
     def count(self) -> None:
         """Increment the counter and log every log_time"""
-        self.end = time.time()
+        self.end = time.monotonic()
         self.item_count += 1
         self.log_count += 1
         if self.log_time is not None and self.end - self.log_start >= self.log_time:
@@ -248,25 +258,24 @@ class OptionsTxt:
             self.options = {}
             return
 
-        with self.path.open("r") as f:
-            txt = f.read()
-        lines = txt.strip().split("\n")
+        txt = self.path.read_text()
         self.options = {}
-        for line in lines:
+        for line in txt.splitlines():
             line = line.strip()
-            if len(line) == 0 or line.startswith("#"):
+            if not line or line[0] == "#":
                 continue
-            key, value = line.split(self.sep, 1)
-            key = key.strip()
-            value = value.strip()
-            self.options[key] = value
+            key, sep, value = line.partition(self.sep)
+            if not sep:
+                raise ValueError(f"Missing {self.sep!r} in {self.path}: {line!r}")
+            self.options[key.strip()] = value.strip()
 
     def save(self) -> None:
         """Save options back to file"""
         assert self.options is not None
-        with self.path.open("w") as f:
-            for key, value in self.options.items():
-                f.write(f"{key}{self.sep}{value}\n")
+        sep = self.sep
+        self.path.write_text(
+            "".join(f"{key}{sep}{value}\n" for key, value in self.options.items())
+        )
 
     def clear(self) -> None:
         """Clear the file"""
@@ -334,6 +343,25 @@ class InstallProgress:
             self.current = current
 
 
+##
+# Web utils
+
+
+_http_local = threading.local()
+
+
+def http_session() -> requests.Session:
+    """requests session for the calling thread. Lets repeated requests (Mojang, Modrinth,
+    downloads) reuse connections instead of doing a new TCP+TLS handshake each time.
+    One per thread since requests doesn't guarantee a Session is thread-safe, and
+    install() makes requests from worker threads."""
+    session: requests.Session | None = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _http_local.session = session
+    return session
+
+
 ##
 # Mojang web API utils
 def mojang_get_version_manifest() -> dict[Any, Any]:
@@ -355,7 +383,7 @@ def mojang_get_version_manifest() -> dict[Any, Any]:
         },
     """
     versions_url = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
-    response = requests.get(versions_url)
+    response = http_session().get(versions_url)
     response.raise_for_status()
     manifest: dict[Any, Any] = response.json()
     return manifest
@@ -375,12 +403,28 @@ def mojang_get_version_details(mc_version: str) -> dict[str, Any]:
     ver_info = mojang_get_version_info(mc_version)
     ver_details_url = ver_info["url"]
 
-    response = requests.get(ver_details_url)
+    response = http_session().get(ver_details_url)
     response.raise_for_status()
     ver_details: dict[str, Any] = response.json()
     return ver_details
 
 
+def download_file(url: str, path: Path, chunk_size: int = 1 << 16) -> None:
+    """Download url to path. Streams to disk in chunks instead of holding the whole
+    file in memory. The data goes to a temp file that replaces path only once the
+    download completes, so a failed download never leaves a truncated file."""
+    part_path = path.with_suffix(path.suffix + ".part")
+    try:
+        with http_session().get(url, stream=True) as response:
+            response.raise_for_status()
+            with open(part_path, "wb") as f:
+                f.writelines(response.iter_content(chunk_size=chunk_size))
+        os.replace(part_path, path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+
+
 ##
 # Misc utils
 
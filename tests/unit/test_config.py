@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import Generator
 
@@ -59,3 +60,50 @@ def test_invalid_config() -> None:
         "instances": [],  # Should be dict
     }
     assert config.Config.from_dict(invalid_data) is None
+
+
+def test_config_manager_cache(fixtures_dir: Path, temp_config_file: Path) -> None:
+    with config.ConfigManager(mcio_dir=fixtures_dir) as cm:
+        cfg = cm.config
+    with config.ConfigManager(temp_config_file, save=True) as cm:
+        cm.config = cfg
+
+    # Changes that aren't saved don't leak into the cached config
+    with config.ConfigManager(temp_config_file) as cm:
+        cm.config.instances.pop("Inst1")
+    with config.ConfigManager(temp_config_file) as cm:
+        assert "Inst1" in cm.config.instances
+
+    # Saved changes are picked up
+    with config.ConfigManager(temp_config_file, save=True) as cm:
+        cm.config.instances.pop("Inst1")
+    with config.ConfigManager(temp_config_file) as cm:
+        assert "Inst1" not in cm.config.instances
+
+    # So are changes made outside ConfigManager
+    cfg_file = temp_config_file / config.CONFIG_FILENAME
+    cfg_file.write_text("config_version: 1\n")
+    with config.ConfigManager(temp_config_file) as cm:
+        assert cm.config.instances == {}
+
+
+def test_config_manager_cache_same_stat(
+    fixtures_dir: Path, temp_config_file: Path
+) -> None:
+    with config.ConfigManager(mcio_dir=fixtures_dir) as cm:
+        cfg = cm.config
+    with config.ConfigManager(temp_config_file, save=True) as cm:
+        cm.config = cfg
+    cfg_file = temp_config_file / config.CONFIG_FILENAME
+    old_stat = cfg_file.stat()
+
+    # A same-size save that doesn't change the mtime, as on coarse-timestamp
+    # filesystems, must not leave the old config in the cache.
+    with config.ConfigManager(temp_config_file, save=True) as cm:
+        assert cm.config.instances["Inst1"].minecraft_version == "1.21.3"
+        cm.config.instances["Inst1"].minecraft_version = "1.21.4"
+    os.utime(cfg_file, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns))
+    assert cfg_file.stat().st_size == old_stat.st_size
+
+    with config.ConfigManager(temp_config_file) as cm:
+        assert cm.config.instances["Inst1"].minecraft_version == "1.21.4"
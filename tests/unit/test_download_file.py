@@ -0,0 +1,54 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Self
+
+import pytest
+
+from mcio_ctrl import util
+
+
+class MockStreamResponse:
+    def __init__(self, chunks: list[bytes], fail: bool = False) -> None:
+        self.chunks = chunks
+        self.fail = fail
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        yield from self.chunks
+        if self.fail:
+            raise ConnectionError("connection dropped")
+
+
+def test_download_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "mod.jar"
+    monkeypatch.setattr(
+        util.http_session(),
+        "get",
+        lambda url, stream: MockStreamResponse([b"abc", b"def"]),
+    )
+    util.download_file("https://example.com/mod.jar", path)
+    assert path.read_bytes() == b"abcdef"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_download_file_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "mod.jar"
+    path.write_bytes(b"old")
+    monkeypatch.setattr(
+        util.http_session(),
+        "get",
+        lambda url, stream: MockStreamResponse([b"abc"], fail=True),
+    )
+    with pytest.raises(ConnectionError):
+        util.download_file("https://example.com/mod.jar", path)
+    # No partial file, and the existing file is untouched
+    assert path.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,38 @@
+import pytest
+from OpenGL import extensions as gl_extensions  # type: ignore
+
+from mcio_ctrl import gui
+
+
+@pytest.fixture
+def gl_context(monkeypatch: pytest.MonkeyPatch) -> pytest.MonkeyPatch:
+    """Fake the GL info PyOpenGL caches for the current context, so no real context
+    is needed. Tests set the version, and the extensions if they need any."""
+    monkeypatch.setattr(gl_extensions.GLQuerier, "extensions", [b"GL_dummy"])
+    return monkeypatch
+
+
+def test_gl_supports_core_version(gl_context: pytest.MonkeyPatch) -> None:
+    # Core contexts don't have to list the ARB extensions
+    gl_context.setattr(gl_extensions.GLQuerier, "version", [4, 6])
+    assert gui._gl_supports(*gui._GL_BUFFER_STORAGE)
+    assert gui._gl_supports(*gui._GL_TEXTURE_STORAGE)
+    assert gui._gl_supports(*gui._GL_MAP_BUFFER_RANGE)
+
+    gl_context.setattr(gl_extensions.GLQuerier, "version", [4, 1])
+    assert not gui._gl_supports(*gui._GL_BUFFER_STORAGE)
+    assert not gui._gl_supports(*gui._GL_TEXTURE_STORAGE)
+    assert gui._gl_supports(*gui._GL_MAP_BUFFER_RANGE)
+
+    # MacOS legacy context
+    gl_context.setattr(gl_extensions.GLQuerier, "version", [2, 1])
+    assert not gui._gl_supports(*gui._GL_MAP_BUFFER_RANGE)
+
+
+def test_gl_supports_extension(gl_context: pytest.MonkeyPatch) -> None:
+    gl_context.setattr(gl_extensions.GLQuerier, "version", [3, 3])
+    gl_context.setattr(
+        gl_extensions.GLQuerier, "extensions", [b"GL_ARB_buffer_storage"]
+    )
+    assert gui._gl_supports(*gui._GL_BUFFER_STORAGE)
+    assert not gui._gl_supports(*gui._GL_TEXTURE_STORAGE)
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mcio_ctrl import instance, util
+
+
+def test_mod_versions_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    versions = [{"version_type": "release", "files": []}]
+    requests_made: list[dict[str, str]] = []
+
+    class MockResponse:
+        def __init__(self, status_code: int) -> None:
+            self.status_code = status_code
+            self.headers = {"ETag": '"v1"'}
+
+        def json(self) -> Any:
+            return versions
+
+        def raise_for_status(self) -> None:
+            pass
+
+    def mock_get(
+        url: str, params: dict[str, str], headers: dict[str, str]
+    ) -> MockResponse:
+        assert url == "https://api.modrinth.com/v2/project/mcio/version"
+        assert params["game_versions"] == '["1.21.3"]'
+        requests_made.append(headers)
+        return MockResponse(304 if headers.get("If-None-Match") == '"v1"' else 200)
+
+    monkeypatch.setattr(util.http_session(), "get", mock_get)
+
+    # First call fetches and caches
+    assert instance._get_mod_versions("mcio", "1.21.3", tmp_path) == versions
+    assert requests_made == [{}]
+
+    # Fresh cache entry. No request
+    assert instance._get_mod_versions("mcio", "1.21.3", tmp_path) == versions
+    assert len(requests_made) == 1
+
+    # Stale cache entry. Revalidated with the ETag
+    cache_file = tmp_path / "modrinth-mcio-1.21.3.json"
+    old = cache_file.stat().st_mtime - instance.MODRINTH_CACHE_TTL - 1
+    os.utime(cache_file, (old, old))
+    assert instance._get_mod_versions("mcio", "1.21.3", tmp_path) == versions
+    assert requests_made[-1] == {"If-None-Match": '"v1"'}
+    assert cache_file.stat().st_mtime > old
+
+
+def test_instance_world_list(fixtures_dir: Path) -> None:
+    im = instance.InstanceManager(fixtures_dir / "test_mcio_dir")
+    assert sorted(im.get_instance_world_list("test_inst1")) == ["World1", "World2"]
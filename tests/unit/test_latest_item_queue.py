@@ -23,6 +23,16 @@ def test_queue_empty_behavior() -> None:
         q.get(block=False)
 
 
+def test_queue_timeout() -> None:
+    q: LatestItemQueue[int] = LatestItemQueue()
+    with pytest.raises(Empty):
+        q.get(timeout=0.01)
+    q.put(1)
+    assert q.get(timeout=0.01) == 1
+    with pytest.raises(Empty):
+        q.get(block=False)  # The get removed the item
+
+
 def test_threaded_operation() -> None:
     q: LatestItemQueue[int] = LatestItemQueue()
 
@@ -1,4 +1,6 @@
 import shutil
+import subprocess
+import sys
 from pathlib import Path
 
 import minecraft_launcher_lib
@@ -99,3 +101,12 @@ def test_instance_launch_list(
     cmd.run(args)
 
     # Not actually checking anything. Just want the code to run.
+
+
+def test_mcio_cmd_skips_gymnasium() -> None:
+    # Keeps mcio command startup fast. Needs a fresh interpreter since the tests
+    # import gymnasium.
+    code = (
+        "import sys, mcio_ctrl.scripts.mcio_cmd; sys.exit('gymnasium' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
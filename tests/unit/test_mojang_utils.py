@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import Any
 
 import pytest
-import requests
 
 from mcio_ctrl import util
 
@@ -34,7 +33,7 @@ def test_mojang_version_functions(
             return MockResponse(mock_version_details)
         raise RuntimeError(f"Unexpected URL: {url}")
 
-    monkeypatch.setattr(requests, "get", mock_requests_get)
+    monkeypatch.setattr(util.http_session(), "get", mock_requests_get)
 
     # Test mojang_get_version_manifest
     manifest = util.mojang_get_version_manifest()
@@ -1,11 +1,15 @@
 import time
+from dataclasses import asdict
 from typing import Any, Generator
 from unittest.mock import MagicMock
 
+import cbor2
+import glfw  # type: ignore
+import numpy as np
 import pytest
 import zmq
 
-from mcio_ctrl import network
+from mcio_ctrl import network, types
 
 
 @pytest.fixture
@@ -15,7 +19,7 @@ def mock_zmq(monkeypatch: pytest.MonkeyPatch) -> dict[str, MagicMock]:
     mock_context = MagicMock()
     mock_socket = MagicMock()
     mock_socket.get_monitor_socket.return_value = MagicMock()
-    mock_context.return_value.socket.return_value = mock_socket
+    mock_context.instance.return_value.socket.return_value = mock_socket
     monkeypatch.setattr("zmq.Context", mock_context)
 
     # Mock the monitor message function
@@ -56,6 +60,23 @@ def test_send(mock_zmq: dict[str, MagicMock], connection: network._Connection) -
     assert action.pack() == mock_zmq["socket"].send.call_args_list[0][0][0]
 
 
+def test_action_pack_matches_asdict() -> None:
+    action = network.ActionPacket(
+        sequence=3,
+        commands=["time set day"],
+        clear_input=True,
+        inputs=[
+            types.InputEvent.from_ints(types.InputType.KEY, glfw.KEY_W, glfw.PRESS),
+            types.InputEvent.from_ints(
+                types.InputType.MOUSE, glfw.MOUSE_BUTTON_LEFT, glfw.RELEASE
+            ),
+        ],
+        cursor_pos=[(1.5, 2.0)],
+    )
+    assert action.pack() == cbor2.dumps(asdict(action))
+    assert network.ActionPacket().pack() == cbor2.dumps(asdict(network.ActionPacket()))
+
+
 def test_recv_observation(
     mock_zmq: dict[str, MagicMock], connection: network._Connection
 ) -> None:
@@ -63,3 +84,77 @@ def test_recv_observation(
     mock_zmq["socket"].recv.return_value = b"garbage packet"
     observation = connection.recv_observation()
     assert observation is None
+
+
+def test_observation_unpack() -> None:
+    obs = network.ObservationPacket(sequence=7, frame=b"abc", health=3.5)
+    unpacked = network.ObservationPacket.unpack(obs.pack())
+    assert unpacked is not None
+    assert unpacked.pack() == obs.pack()  # cbor returns tuples as lists
+
+    # pack() is shallow but encodes like asdict()
+    obs.inventory_main = [types.InventorySlot(slot=0, id="minecraft:dirt", count=3)]
+    expected = asdict(obs)
+    del expected["_frame_cache"]
+    assert obs.pack() == cbor2.dumps(expected)
+    unpacked = network.ObservationPacket.unpack(obs.pack())
+    assert unpacked is not None
+    assert unpacked.pack() == obs.pack()
+
+    # Packets with missing fields get the defaults
+    partial = cbor2.dumps({"version": network.MCIO_PROTOCOL_VERSION, "sequence": 8})
+    unpacked = network.ObservationPacket.unpack(partial)
+    assert unpacked is not None
+    assert unpacked.pack() == network.ObservationPacket(sequence=8).pack()
+
+    # Unknown field
+    bad = asdict(obs)
+    del bad["_frame_cache"]
+    bad["bogus"] = bad.pop("health")
+    assert network.ObservationPacket.unpack(cbor2.dumps(bad)) is None
+
+
+def test_conflate(mock_zmq: dict[str, MagicMock]) -> None:
+    conn = network._Connection(wait_for_connection=False, conflate=True)
+    mock_zmq["socket"].setsockopt.assert_any_call(zmq.CONFLATE, 1)
+    conn.close()
+    conn.monitor_thread.join()  # Don't let it outlive the zmq mocks
+
+
+@pytest.mark.parametrize("cursor_mode", [glfw.CURSOR_NORMAL, glfw.CURSOR_DISABLED])
+def test_get_frame_with_cursor_out(cursor_mode: int) -> None:
+    height, width = 20, 30
+    raw = np.arange(height * width * 3, dtype=np.uint8)
+    obs = network.ObservationPacket(
+        frame=raw.tobytes(),
+        frame_height=height,
+        frame_width=width,
+        cursor_mode=cursor_mode,
+        cursor_pos=(10, 5),
+    )
+    expected = obs.get_frame_with_cursor()
+
+    out = np.zeros((height, width, 3), dtype=np.uint8)
+    frame = obs.get_frame_with_cursor(out=out)
+    assert frame is out
+    assert np.array_equal(out, expected)
+
+
+def test_cache_frame_with_cursor() -> None:
+    height, width = 20, 30
+    raw = np.arange(height * width * 3, dtype=np.uint8)
+    obs = network.ObservationPacket(
+        frame=raw.tobytes(), frame_height=height, frame_width=width
+    )
+    expected = obs.get_frame_with_cursor()
+
+    obs.cache_frame_with_cursor()
+    frame = obs.get_frame_with_cursor()
+    assert frame is obs.get_frame_with_cursor()
+    assert np.array_equal(frame, expected)
+
+    # The cache isn't part of the packet
+    unpacked = network.ObservationPacket.unpack(obs.pack())
+    assert unpacked is not None
+    assert unpacked.frame == obs.frame
+    assert unpacked._frame_cache is None
@@ -106,3 +106,15 @@ def test_options_txt_exception_handling(test_path: Path) -> None:
     with util.OptionsTxt(test_file) as opts:
         assert opts.options is not None
         assert "new" not in opts.options
+
+
+def test_options_txt_parsing(test_path: Path) -> None:
+    test_file: Path = test_path / "options.txt"
+    test_file.write_bytes(b"foo:bar\r\nspaces : a b \r\nurl:http://x\r\n")
+
+    with util.OptionsTxt(test_file) as opts:
+        assert opts.options == {"foo": "bar", "spaces": "a b", "url": "http://x"}
+
+    test_file.write_text("foo:bar\nmalformed\n")
+    with pytest.raises(ValueError, match="malformed"):
+        util.OptionsTxt(test_file).load()
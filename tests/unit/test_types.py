@@ -0,0 +1,8 @@
+import glfw  # type: ignore
+
+from mcio_ctrl import types
+
+
+def test_glfw_action_values() -> None:
+    assert types.GlfwAction.RELEASE == glfw.RELEASE
+    assert types.GlfwAction.PRESS == glfw.PRESS